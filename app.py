@@ -2,14 +2,141 @@
 #  STREAMLIT UI FOR GENETIC ALGORITHM SCHEDULER
 # -----------------------------------------------------------
 
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 
-from ga.engine import run_genetic_algorithm
+from ga.engine import iter_genetic_algorithm, warm_up
 from ga.schedule import Schedule
 from ga.fitness import compute_violations
 
+# -----------------------------------------------------------
+# Cached helpers (Streamlit reruns this script on every widget change)
+# -----------------------------------------------------------
+
+@st.cache_resource
+def _warm_up_kernels() -> bool:
+    """JIT-compile the GA kernels once per server process, not on first run."""
+    warm_up()
+    return True
+
+
+@st.cache_data
+def _schedule_to_df(schedule_key: bytes, _schedule: Schedule) -> pd.DataFrame:
+    """Schedule → DataFrame, keyed on the genome bytes (the schedule itself is not hashed)."""
+    return _schedule.to_dataframe()
+
+
+MAX_CACHED_RUNS = 32  # finished runs kept in the process-wide memo
+
+
+@st.cache_resource
+def _run_cache() -> tuple:
+    """
+    Process-wide memo shared by every session, so identical settings
+    return instantly: (OrderedDict {(config, seed): results} in LRU order,
+    a lock guarding it, and {key: lock} for runs still in progress).
+    The worker count does not change the result, so it is not part of
+    the key.
+    """
+    return OrderedDict(), threading.Lock(), {}
+
+
+def _run_with_live_chart(config: dict) -> dict:
+    """
+    Run the GA generation by generation, redrawing a live fitness chart
+    at most ~20 times per second (not every generation).
+    """
+    rows = []
+    last_draw = 0.0
+
+    with st.status("Running Genetic Algorithm...", expanded=True) as status:
+        chart = st.empty()
+        run = iter_genetic_algorithm(**config)
+        while True:
+            try:
+                rows.append(next(run))
+            except StopIteration as stop:
+                results = stop.value
+                break
+
+            now = time.perf_counter()
+            if now - last_draw >= 0.05:
+                chart.line_chart(pd.DataFrame(rows), x="generation", y=["best", "avg", "worst"])
+                last_draw = now
+
+        status.update(
+            label=f"Finished after {results['generations_run']} generations",
+            state="complete",
+            expanded=False
+        )
+
+    return results
+
+
+def _cached_run(config: dict, n_workers: int) -> dict:
+    """
+    Results for `config`, from the memo when possible. A session asking
+    for a key that another session is still running waits for that run
+    instead of starting a duplicate.
+    """
+    runs, lock, in_flight = _run_cache()
+    key = tuple(config.values())
+
+    with lock:
+        if key in runs:
+            runs.move_to_end(key)
+            return runs[key]
+        key_lock = in_flight.setdefault(key, threading.Lock())
+
+    with key_lock:
+        # Another session may have finished this run while we waited
+        with lock:
+            if key in runs:
+                runs.move_to_end(key)
+                return runs[key]
+        try:
+            results = _run_with_live_chart(dict(config, n_workers=n_workers))
+            with lock:
+                runs[key] = results
+                # Evict least recently used runs
+                while len(runs) > MAX_CACHED_RUNS:
+                    runs.popitem(last=False)
+        finally:
+            with lock:
+                in_flight.pop(key, None)
+    return results
+
+
+@st.cache_data
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data
+def _groups(df: pd.DataFrame, col: str) -> dict:
+    """Split df into {value: rows} once per schedule instead of a groupby every rerun."""
+    return {key: df[df[col] == key] for key in sorted(df[col].unique())}
+
+
+@st.fragment
+def _show_best_schedule_table(df):
+    """Best-schedule table; only this fragment re-renders when the row count changes."""
+    row_mode = st.radio(
+        "How many activities to show?",
+        ["First 6", "All"],
+        horizontal=True
+    )
+
+    df_display = df.head(6) if row_mode == "First 6" else df
+    st.dataframe(df_display, use_container_width=True)
+
+
 # Persistent GA results across UI interactions
 if "ga_results" not in st.session_state:
     st.session_state.ga_results = None
@@ -19,6 +146,8 @@ st.set_page_config(
     layout="wide"
 )
 
+_warm_up_kernels()
+
 st.title("📅 SLA Activity Scheduler — Genetic Algorithm")
 st.write("This tool uses a genetic algorithm to optimize room, time, and facilitator assignments.")
 
@@ -74,6 +203,35 @@ elitism_count = st.sidebar.slider(
     value=1
 )
 
+auto_halve_mutation = st.sidebar.checkbox(
+    "Auto-halve Mutation Rate When Progress Stalls",
+    value=False
+)
+
+cpu_count = os.cpu_count() or 1
+n_workers = st.sidebar.slider(
+    "Parallel Workers",
+    min_value=1,
+    max_value=max(cpu_count, 2),
+    value=cpu_count,
+    help="With Numba installed: threads used by the fitness and breeding "
+         "kernels. Without Numba, fitness is one vectorized NumPy pass and "
+         "populations of this size are scored in a single process, so this "
+         "setting has no effect."
+)
+
+# Random default per session; re-using a seed reproduces (and re-uses) a run
+if "seed" not in st.session_state:
+    st.session_state.seed = random.randrange(1_000_000)
+
+seed = st.sidebar.number_input(
+    "Random Seed",
+    min_value=0,
+    max_value=999_999,
+    step=1,
+    key="seed"
+)
+
 run_button = st.sidebar.button("🚀 Run Genetic Algorithm")
 
 
@@ -82,15 +240,21 @@ run_button = st.sidebar.button("🚀 Run Genetic Algorithm")
 # -----------------------------------------------------------
 
 if run_button:
-    with st.spinner("Running Genetic Algorithm... This may take a moment."):
-        st.session_state.ga_results = run_genetic_algorithm(
-            population_size=population_size,
-            min_generations=min_generations,
-            max_generations=max_generations,
-            initial_mutation_rate=mutation_rate,
-            crossover_mode=crossover_mode,
-            elitism_count=elitism_count
-        )
+    config = dict(
+        population_size=population_size,
+        min_generations=min_generations,
+        max_generations=max_generations,
+        initial_mutation_rate=mutation_rate,
+        crossover_mode=crossover_mode,
+        elitism_count=elitism_count,
+        seed=seed,
+        auto_halve_mutation=auto_halve_mutation
+    )
+    st.session_state.ga_results = _cached_run(config, n_workers)
+
+    # Write the export once per run, not on every rerun
+    os.makedirs("output", exist_ok=True)
+    st.session_state.ga_results["best_schedule"].save_csv("output/best_schedule.csv")
 
 
 # -----------------------------------------------------------
@@ -118,53 +282,41 @@ if st.session_state.ga_results is not None:
     # -----------------------------------------------------------
     st.subheader("📈 Fitness Over Generations")
 
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(df_history["generation"], df_history["best"], label="Best Fitness", linewidth=2)
-    ax.plot(df_history["generation"], df_history["avg"], label="Average Fitness", linestyle="--")
-    ax.plot(df_history["generation"], df_history["worst"], label="Worst Fitness", linestyle=":")
-    ax.set_xlabel("Generation")
-    ax.set_ylabel("Fitness")
-    ax.grid(True, linestyle="--", alpha=0.4)
-    ax.legend()
-
-    st.pyplot(fig)
+    st.line_chart(
+        df_history.rename(columns={
+            "best": "Best Fitness",
+            "avg": "Average Fitness",
+            "worst": "Worst Fitness",
+        }),
+        x="generation",
+        y=["Best Fitness", "Average Fitness", "Worst Fitness"],
+        x_label="Generation",
+        y_label="Fitness"
+    )
 
     # -----------------------------------------------------------
     # Best Schedule Table
     # -----------------------------------------------------------
     st.subheader("🏆 Best Schedule (Final Generation)")
 
-    row_mode = st.radio(
-        "How many activities to show?",
-        ["First 6", "All"],
-        horizontal=True
-    )
+    df = _schedule_to_df(best_schedule.hash_key(), best_schedule)
 
+    # The sort order also applies to the groupings and the CSV download,
+    # so this radio stays outside the table fragment
     sort_mode = st.radio(
         "Sort Schedule By:",
         ["Time", "Activity"],
         horizontal=True
     )
 
-    df = best_schedule.to_dataframe()
-
-    time_order = {
-        "10 AM": 10,
-        "11 AM": 11,
-        "12 PM": 12,
-        "1 PM": 13,
-        "2 PM": 14,
-        "3 PM": 15,
-    }
-
+    # "Time" is an ordered Categorical (see Schedule.to_dataframe), so it
+    # sorts chronologically without a helper column
     if sort_mode == "Time":
-        df["TimeSort"] = df["Time"].map(time_order)
-        df = df.sort_values(["TimeSort", "Activity"], ascending=[True, True]).drop(columns=["TimeSort"])
+        df = df.sort_values(["Time", "Activity"])
     else:
         df = df.sort_values("Activity")
 
-    df_display = df.head(6) if row_mode == "First 6" else df
-    st.dataframe(df_display, use_container_width=True)
+    _show_best_schedule_table(df)
 
     # -----------------------------------------------------------
     # Optional: Group by Room / Facilitator
@@ -172,14 +324,12 @@ if st.session_state.ga_results is not None:
     st.subheader("📚 Optional Groupings")
 
     with st.expander("🏫 Group Activities by Room"):
-        grouped_room = df.groupby("Room")
-        for room, table in grouped_room:
+        for room, table in _groups(df, "Room").items():
             st.markdown(f"### Room: **{room}**")
             st.dataframe(table, use_container_width=True)
 
     with st.expander("🧑‍🏫 Group Activities by Facilitator"):
-        grouped_fac = df.groupby("Facilitator")
-        for fac, table in grouped_fac:
+        for fac, table in _groups(df, "Facilitator").items():
             st.markdown(f"### Facilitator: **{fac}**")
             st.dataframe(table, use_container_width=True)
 
@@ -188,8 +338,7 @@ if st.session_state.ga_results is not None:
     # -----------------------------------------------------------
     st.subheader("⬇️ Downloads")
 
-    csv = df.to_csv(index=False).encode("utf-8")
-    best_schedule.save_csv("output/best_schedule.csv")
+    csv = _csv_bytes(df)
 
     st.download_button(
         label="📥 Download Schedule as CSV",
@@ -2,44 +2,30 @@
 #  PHASE 5: Crossover Operations
 # -----------------------------------------------------------
 
-import random
-from ga.schedule import Schedule
-from ga.data import ACTIVITIES
+import numpy as np
+from ga.data import N_ACTIVITIES
+from ga.rng import RNG
 
 
-ACTIVITY_LIST = list(ACTIVITIES.keys())  # fixed order of activities
+def sample_crossover_rows(n_children, crossover_mode="single_point", rng=RNG):
+    """
+    Draw the crossover for n_children children at once.
 
+    Returns a (n_children, 11) bool array: True -> the child copies that
+    activity's row from parent A, False -> from parent B.
 
-def single_point_crossover(parent_a, parent_b):
-    """
     Single-point crossover:
-      - Choose index k
-      - First k activities copied from parent A
+      - Choose index k per child
+      - Activities 0..k copied from parent A
       - Remaining copied from parent B
-    """
-    k = random.randint(0, len(ACTIVITY_LIST) - 1)
-    child_assignments = {}
-
-    for i, activity in enumerate(ACTIVITY_LIST):
-        if i <= k:
-            child_assignments[activity] = parent_a.assignments[activity].copy()
-        else:
-            child_assignments[activity] = parent_b.assignments[activity].copy()
-
-    return Schedule(child_assignments)
 
-
-def uniform_crossover(parent_a, parent_b, swap_prob=0.5):
-    """
     Uniform crossover:
       - For each activity, choose parent A or B with equal probability.
-    """
-    child_assignments = {}
 
-    for activity in ACTIVITY_LIST:
-        if random.random() < swap_prob:
-            child_assignments[activity] = parent_a.assignments[activity].copy()
-        else:
-            child_assignments[activity] = parent_b.assignments[activity].copy()
+    Draws come from `rng` (a NumPy Generator).
+    """
+    if crossover_mode == "uniform":
+        return rng.random((n_children, N_ACTIVITIES)) < 0.5
 
-    return Schedule(child_assignments)
+    cut_points = rng.integers(0, N_ACTIVITIES, size=n_children)
+    return np.arange(N_ACTIVITIES) <= cut_points[:, None]
@@ -2,6 +2,8 @@
 #  PHASE 1: DATA DEFINITIONS FOR GENETIC ALGORITHM SCHEDULER
 # -----------------------------------------------------------
 
+import numpy as np
+
 # -------------------------------
 # Facilitators (10 total)
 # -------------------------------
@@ -146,3 +148,54 @@ ROOM_EQUIPMENT = {
     "Loft 206": {"lab": False, "projector": False},
     "Roman 201": {"lab": False, "projector": False},
 }
+
+
+# -------------------------------
+# Integer index maps (genome encoding)
+# A schedule genome is an (N_ACTIVITIES, 3) int8 array; each row holds
+# the (room, time, facilitator) indices for one activity, in the
+# order of ACTIVITY_NAMES.
+# -------------------------------
+ACTIVITY_NAMES = list(ACTIVITIES.keys())
+ROOM_NAMES = list(ROOMS.keys())
+
+ACT_IDX = {a: i for i, a in enumerate(ACTIVITY_NAMES)}
+ROOM_IDX = {r: i for i, r in enumerate(ROOM_NAMES)}
+TIME_IDX = {t: i for i, t in enumerate(TIME_SLOTS)}
+FAC_IDX = {f: i for i, f in enumerate(FACILITATORS)}
+
+N_ACTIVITIES = len(ACTIVITY_NAMES)
+N_ROOMS = len(ROOM_NAMES)
+N_TIMES = len(TIME_SLOTS)
+N_FACILITATORS = len(FACILITATORS)
+
+# Genome column for each attribute
+GENE_ROOM = 0
+GENE_TIME = 1
+GENE_FAC = 2
+
+# Number of possible values per genome column (room, time, facilitator)
+GENE_DOMAIN_SIZES = (N_ROOMS, N_TIMES, N_FACILITATORS)
+
+
+# -------------------------------
+# Lookup tables (indexed by genome integers)
+# Built once at import so the fitness code reads array elements
+# instead of scanning name lists on every evaluation.
+# -------------------------------
+ROOM_CAP = np.array([ROOMS[r] for r in ROOM_NAMES])
+ACT_EXPECTED = np.array([ACTIVITIES[a]["expected"] for a in ACTIVITY_NAMES])
+
+# ROOM_BEACH_ROMAN[room_idx]: is the room in the Beach or Roman buildings?
+# (used by the SLA101/SLA191 walking-distance rule)
+ROOM_BEACH_ROMAN = np.array([r.startswith(("Beach", "Roman")) for r in ROOM_NAMES], dtype=bool)
+
+# PREF_TABLE[act_idx, fac_idx] / OTHER_TABLE[act_idx, fac_idx]:
+# is the facilitator on that activity's preferred / other list?
+PREF_TABLE = np.zeros((N_ACTIVITIES, N_FACILITATORS), dtype=bool)
+OTHER_TABLE = np.zeros_like(PREF_TABLE)
+for _a, _name in enumerate(ACTIVITY_NAMES):
+    for _fac in ACTIVITIES[_name]["preferred"]:
+        PREF_TABLE[_a, FAC_IDX[_fac]] = True
+    for _fac in ACTIVITIES[_name]["other"]:
+        OTHER_TABLE[_a, FAC_IDX[_fac]] = True
@@ -4,33 +4,228 @@
 
 from __future__ import annotations
 
-from statistics import mean
-from typing import List, Dict, Any, Tuple
+import atexit
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional, Generator
+
+import numpy as np
 
 from ga.population import initialize_population
-from ga.fitness import compute_schedule_fitness
-from ga.selection import softmax, select_parents
-from ga.crossover import single_point_crossover, uniform_crossover
-from ga.mutation import mutate
-from ga.data import ACTIVITIES
+from ga.schedule import Schedule
+from ga.fitness import evaluate_genomes, _genome_fitness
+from ga.jit import HAVE_NUMBA, PARALLEL_LOCK, njit, prange, set_num_threads
+from ga.selection import softmax, select_parent_indices
+from ga.crossover import sample_crossover_rows
+from ga.mutation import sample_mutations
+from ga.data import N_ACTIVITIES
+from ga.rng import RNG
+
+
+# -----------------------------------------------------------
+# Worker pool (master-slave fitness evaluation)
+# -----------------------------------------------------------
+# The pool lives at module level so it is reused across generations
+# (and across runs) instead of paying the fork cost every generation.
+# Concurrent runs (one per Streamlit session thread) share it, so it is
+# created once at a fixed size under a lock and never resized; a run's
+# n_workers only sets how many shards it submits.
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+# Below this many genomes, a pool round trip costs more than the whole
+# vectorized NumPy evaluation, so they are scored sequentially in the master.
+# Measured: 0.3 ms sequential vs 1.2-2.2 ms pooled at P=250, 1.3 ms vs
+# 2.0 ms at P=1000; the pool only breaks even in the tens of thousands.
+# This is above the app's largest population, so the pool stays idle there.
+MIN_PARALLEL_GENOMES = 10_000
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool (one process per CPU core), creating it on first use."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared worker pool, if one is running (only at interpreter exit)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown()
+            _POOL = None
 
 
-def evaluate_population(population) -> Tuple[list[float], float, float, float]:
+atexit.register(shutdown_pool)
+
+
+# -----------------------------------------------------------
+# Fused breeding (crossover + mutation + fitness in one pass)
+# -----------------------------------------------------------
+# All random draws for a generation are made up front from the run's
+# Generator (so seeded runs stay reproducible); the kernels then only copy genes.
+
+
+@njit(cache=True)
+def _make_child(population, parent_idx, take_a, mut_mask, mut_values, out, i):
+    """
+    Write child i into out[i]: row r comes from parent A where
+    take_a[i, r] is set (else parent B), then every gene flagged in
+    mut_mask[i] is replaced by mut_values[i].
     """
-    Compute fitness for each schedule in the population and return:
+    parent_a = population[parent_idx[i, 0]]
+    parent_b = population[parent_idx[i, 1]]
+    for r in range(take_a.shape[1]):
+        for c in range(3):
+            if mut_mask[i, r, c]:
+                out[i, r, c] = mut_values[i, r, c]
+            elif take_a[i, r]:
+                out[i, r, c] = parent_a[r, c]
+            else:
+                out[i, r, c] = parent_b[r, c]
+
+
+@njit(cache=True, parallel=True)
+def _breed_and_score_kernel(population, parent_idx, take_a, mut_mask, mut_values, out, out_fitness):
+    """
+    Build every child (see _make_child), one child per thread, and score
+    it while it is still hot in cache.
+    """
+    for i in prange(parent_idx.shape[0]):
+        _make_child(population, parent_idx, take_a, mut_mask, mut_values, out, i)
+        out_fitness[i] = _genome_fitness(out[i])
+
+
+def _breed_numpy(population, parent_idx, take_a, mut_mask, mut_values, out):
+    """Vectorized child construction (no scoring), used when Numba is missing."""
+    np.copyto(
+        out,
+        np.where(take_a[:, :, None], population[parent_idx[:, 0]], population[parent_idx[:, 1]]),
+    )
+    np.copyto(out, mut_values, where=mut_mask)
+
+
+def breed(
+    population,
+    probabilities,
+    out,
+    out_fitness,
+    crossover_mode: str,
+    mutation_rate: float,
+    rng=RNG,
+) -> None:
+    """
+    Fill every row of `out` with a child of two softmax-selected parents
+    from `population`: crossover + mutation in a single kernel call, with
+    no per-child intermediate arrays.
+
+    Each child's fitness is written to `out_fitness` (a float array, one
+    slot per child); with Numba this happens inside the same kernel, so
+    the new generation never needs a separate evaluation pass.
+
+    Every random draw comes from `rng` (a NumPy Generator).
+    """
+    n_children = len(out)
+    if n_children == 0:
+        return
+
+    parent_idx = select_parent_indices(probabilities, n_children, rng)
+
+    # Crossover rows: True -> copy the row from parent A
+    take_a = sample_crossover_rows(n_children, crossover_mode, rng)
+
+    # Mutation: which genes flip, and the random valid value for each
+    mut_mask, mut_values = sample_mutations(n_children, mutation_rate, rng)
+
+    if HAVE_NUMBA:
+        with PARALLEL_LOCK:
+            _breed_and_score_kernel(population, parent_idx, take_a, mut_mask, mut_values, out, out_fitness)
+    else:
+        _breed_numpy(population, parent_idx, take_a, mut_mask, mut_values, out)
+        out_fitness[:] = evaluate_genomes(out)
+
+
+# -----------------------------------------------------------
+# Mutation-rate control
+# -----------------------------------------------------------
+# Automatic mutation-rate halving (auto_halve_mutation=True): when the mean
+# improvement over the last MUTATION_WINDOW generations drops below
+# MUTATION_STALL_PCT percent, halve the rate (never below MIN_MUTATION_RATE).
+MUTATION_WINDOW = 10
+MUTATION_STALL_PCT = 0.5
+MIN_MUTATION_RATE = 1e-4
+
+
+# -----------------------------------------------------------
+# Batched fitness evaluation
+# -----------------------------------------------------------
+def _score_genomes(genomes, n_workers: int) -> np.ndarray:
+    """Batched fitness of a (P, 11, 3) genome array (threads or process shards)."""
+    if n_workers > 1 and not HAVE_NUMBA and len(genomes) >= MIN_PARALLEL_GENOMES:
+        pool = _get_pool()
+        shards = np.array_split(genomes, n_workers)
+        return np.concatenate(list(pool.map(evaluate_genomes, shards)))
+
+    set_num_threads(n_workers)
+    return evaluate_genomes(genomes)
+
+
+def warm_up() -> None:
+    """
+    Compile (or load from Numba's on-disk cache) the kernels the GA loop
+    uses, on a tiny dummy population, so the first generation of the
+    first run does not pay the JIT cost. Draws no random numbers.
+    No-op without Numba.
+    """
+    if not HAVE_NUMBA:
+        return
+
+    population = np.zeros((2, N_ACTIVITIES, 3), dtype=np.int8)
+    parent_idx = np.zeros((2, 2), dtype=np.int64)
+    take_a = np.ones((2, N_ACTIVITIES), dtype=bool)
+    mut_mask = np.zeros((2, N_ACTIVITIES, 3), dtype=bool)
+    out = np.empty_like(population)
+    with PARALLEL_LOCK:
+        _breed_and_score_kernel(population, parent_idx, take_a, mut_mask, population.copy(), out, np.empty(2))
+    evaluate_genomes(population)
+
+
+def evaluate_population(population, n_workers: int = 1) -> Tuple[list[float], float, float, float]:
+    """
+    Compute fitness for each genome in the (P, 11, 3) population array
+    and return:
       - list of fitness values
       - best fitness
       - avg fitness
       - worst fitness
+
+    The whole population is scored in a single batched call. With
+    n_workers > 1 that call runs on up to n_workers Numba threads.
+    Without Numba it is one vectorized NumPy pass in the master; only
+    batches of at least MIN_PARALLEL_GENOMES are split into n_workers
+    shards for the process pool. Selection/crossover/mutation always stay
+    in the master.
     """
-    fitness_list: List[float] = []
-    for schedule in population:
-        f = compute_schedule_fitness(schedule)
-        fitness_list.append(f)
+    fitness = _score_genomes(population, n_workers)
+
+    return summarize_fitness(fitness)
 
-    best_f = max(fitness_list)
-    avg_f = mean(fitness_list)
-    worst_f = min(fitness_list)
+
+def summarize_fitness(fitness) -> Tuple[list[float], float, float, float]:
+    """
+    (fitness list, best, avg, worst) for an already-computed fitness array.
+    """
+    fitness_list: List[float] = fitness.tolist()
+
+    # Reductions run on the array in C; floats returned for the history rows
+    best_f = float(fitness.max())
+    avg_f = float(fitness.mean())
+    worst_f = float(fitness.min())
     return fitness_list, best_f, avg_f, worst_f
 
 
@@ -41,11 +236,51 @@ def run_genetic_algorithm(
     initial_mutation_rate: float = 0.01,
     crossover_mode: str = "single_point",  # or "uniform"
     elitism_count: int = 1,
+    n_workers: Optional[int] = None,  # None -> one worker per CPU core
+    seed: Optional[int] = None,  # None -> unseeded (different every run)
+    auto_halve_mutation: bool = False,  # halve mutation_rate when progress stalls
 ) -> Dict[str, Any]:
     """
-    Run the full genetic algorithm loop.
+    Run the full genetic algorithm loop to completion.
+
+    Same arguments and result as iter_genetic_algorithm, without the
+    per-generation updates.
+    """
+    run = iter_genetic_algorithm(
+        population_size=population_size,
+        min_generations=min_generations,
+        max_generations=max_generations,
+        initial_mutation_rate=initial_mutation_rate,
+        crossover_mode=crossover_mode,
+        elitism_count=elitism_count,
+        n_workers=n_workers,
+        seed=seed,
+        auto_halve_mutation=auto_halve_mutation,
+    )
+    while True:
+        try:
+            next(run)
+        except StopIteration as stop:
+            return stop.value
+
+
+def iter_genetic_algorithm(
+    population_size: int = 250,
+    min_generations: int = 100,
+    max_generations: int = 500,
+    initial_mutation_rate: float = 0.01,
+    crossover_mode: str = "single_point",  # or "uniform"
+    elitism_count: int = 1,
+    n_workers: Optional[int] = None,  # None -> one worker per CPU core
+    seed: Optional[int] = None,  # None -> unseeded (different every run)
+    auto_halve_mutation: bool = False,  # halve mutation_rate when progress stalls
+) -> Generator[Dict[str, Any], None, Dict[str, Any]]:
+    """
+    Run the full genetic algorithm loop as a generator.
 
-    Returns a dictionary containing:
+    Yields each generation's metrics row (see "history" below) as soon as
+    it is computed, so callers can show progress live. The generator's
+    return value (StopIteration.value) is a dictionary containing:
       - "best_schedule": best schedule from final generation
       - "history": list of per-generation metrics:
             {
@@ -63,13 +298,25 @@ def run_genetic_algorithm(
     # -----------------------------
     # 1. Initialize population
     # -----------------------------
-    population = initialize_population(size=population_size)
+    # Each run owns its Generator, so concurrent runs never share state
+    rng = np.random.default_rng(seed)
+
+    population = initialize_population(size=population_size, rng=rng)
+    # Second buffer for the next generation; the two are swapped each
+    # generation instead of allocating a fresh population.
+    spare = np.empty_like(population)
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
 
     mutation_rate = initial_mutation_rate
     history: List[Dict[str, Any]] = []
+    improvement_window: deque = deque(maxlen=MUTATION_WINDOW)
 
     prev_avg = None
     generations = 0
+    fitness_list = None
+    next_fitness = None  # fitness of `population` when scored during breeding
 
     for gen in range(max_generations):
         generations = gen + 1  # human-readable generation count
@@ -77,7 +324,10 @@ def run_genetic_algorithm(
         # -----------------------------
         # 2. Evaluate population
         # -----------------------------
-        fitness_list, best_f, avg_f, worst_f = evaluate_population(population)
+        if next_fitness is None:
+            fitness_list, best_f, avg_f, worst_f = evaluate_population(population, n_workers)
+        else:
+            fitness_list, best_f, avg_f, worst_f = summarize_fitness(next_fitness)
 
         # -----------------------------
         # 3. Compute improvement %
@@ -103,6 +353,7 @@ def run_genetic_algorithm(
                 "mutation_rate": mutation_rate,
             }
         )
+        yield history[-1]
 
         # -----------------------------
         # 5. Check stopping conditions
@@ -121,44 +372,29 @@ def run_genetic_algorithm(
         # (a) Parent selection using softmax probabilities
         probabilities = softmax(fitness_list)
 
-        # We'll generate one child per pair to keep the new generation size ~ population_size.
-        num_pairs = population_size
-
-        parent_pairs = select_parents(population, probabilities, num_pairs)
-
-        children = []
-
-        for parent_a, parent_b in parent_pairs:
-            # (b) Crossover
-            if crossover_mode == "uniform":
-                child = uniform_crossover(parent_a, parent_b)
-            else:
-                child = single_point_crossover(parent_a, parent_b)
-
-            # (c) Mutation
-            mutate(child, mutation_rate=mutation_rate)
-
-            children.append(child)
+        # (b) + (c) Crossover and mutation fill the next generation after
+        # the elite slots in one fused pass (population size stays constant).
+        # Every child is scored as it is bred (inside the same kernel with
+        # Numba, one vectorized pass without), so step 2 of the next
+        # generation has nothing left to evaluate.
+        n_elites = min(elitism_count, population_size)
+        next_fitness = np.empty(population_size)
+        set_num_threads(n_workers)
+        breed(population, probabilities, spare[n_elites:], next_fitness[n_elites:],
+              crossover_mode, mutation_rate, rng=rng)
 
         # (d) Elitism: carry over top N schedules unchanged
-        # Sort population by fitness descending, keep elites
-        # We reuse fitness_list and population aligned by index
-        indexed = list(zip(population, fitness_list))
-        indexed.sort(key=lambda x: x[1], reverse=True)
-
-        elites = [sch for sch, _ in indexed[:elitism_count]]
-
-        # Build the next generation
-        # Ensure population size stays constant
-        new_population = elites + children
-        if len(new_population) > population_size:
-            new_population = new_population[:population_size]
-        elif len(new_population) < population_size:
-            # If slightly short, just duplicate some children
-            deficit = population_size - len(new_population)
-            new_population.extend(children[:deficit])
-
-        population = new_population
+        # Partial selection (O(P)) of the N fittest; their order does not matter
+        # We reuse fitness_list and population aligned by index. Elites keep
+        # their known scores, so they are never re-evaluated.
+        if n_elites > 0:
+            fitness_arr = np.asarray(fitness_list)
+            elite_idx = np.argpartition(fitness_arr, -n_elites)[-n_elites:]
+            spare[:n_elites] = population[elite_idx]
+            next_fitness[:n_elites] = fitness_arr[elite_idx]
+
+        population, spare = spare, population
+        fitness_list = None  # the new generation has not been summarized yet
 
         # ------------------------------------------------
         # 7. (Optional) Mutation Rate Experimentation
@@ -169,27 +405,37 @@ def run_genetic_algorithm(
         #    As long as your results continue to improve, continue cutting the
         #    mutation rate in half until things appear to be stable."
         #
-        # Instead of auto-adjusting here, we expose mutation_rate as a parameter
-        # and record it in the history. In your experiments (and video), you can:
-        #   - Run once with 0.01
-        #   - Then again with 0.005, 0.0025, ...
-        # and compare fitness curves.
-        #
-        # If you *want* automatic halving logic, you could add something like:
-        #
-        # if gen > 0 and gen % 50 == 0:
-        #     mutation_rate = max(mutation_rate / 2.0, 1e-4)
-        #
-        # But for strict assignment interpretation, manual experimentation is fine.
+        # By default mutation_rate stays fixed and is recorded in the history,
+        # so it can be halved by hand between runs (0.01, 0.005, 0.0025, ...).
+        # With auto_halve_mutation=True the same halving happens automatically
+        # whenever the recent average improvement stalls.
+        if improvement is not None:
+            improvement_window.append(improvement)
+
+        if (
+            auto_halve_mutation
+            and len(improvement_window) == MUTATION_WINDOW
+            and sum(improvement_window) / MUTATION_WINDOW < MUTATION_STALL_PCT
+        ):
+            mutation_rate = max(mutation_rate / 2.0, MIN_MUTATION_RATE)
+            improvement_window.clear()  # give the new rate a full window
 
     # ---------------------------------
     # End of GA loop
     # ---------------------------------
 
-    # Identify final best schedule
-    final_fitness_list, final_best, final_avg, final_worst = evaluate_population(population)
-    best_index = max(range(len(population)), key=lambda i: final_fitness_list[i])
-    best_schedule = population[best_index]
+    # Identify final best schedule. When the loop stopped early, fitness_list
+    # already scores the final population; only a population bred in the
+    # last allowed generation still needs evaluating.
+    if fitness_list is None and next_fitness is not None:
+        fitness_list = next_fitness.tolist()
+    elif fitness_list is None:
+        fitness_list = evaluate_population(population, n_workers)[0]
+    best_index = max(range(len(population)), key=fitness_list.__getitem__)
+
+    # Only the winner is wrapped in a Schedule (for display/export)
+    best_schedule = Schedule(population[best_index].copy())
+    best_schedule.fitness = fitness_list[best_index]
 
     result = {
         "best_schedule": best_schedule,
@@ -2,54 +2,90 @@
 #  PHASE 4: Fitness Function (Appendix A)
 # -----------------------------------------------------------
 
+import numpy as np
+
 from ga.data import (
-    ACTIVITIES,
-    ROOMS,
-    TIME_SLOTS,
+    ACT_IDX,
+    FAC_IDX,
+    ROOM_CAP,
+    ACT_EXPECTED,
+    ROOM_BEACH_ROMAN,
+    PREF_TABLE,
+    OTHER_TABLE,
+    N_ROOMS,
+    N_TIMES,
+    N_FACILITATORS,
     PAIR_SLA101,
     PAIR_SLA191,
     CROSS_101_191,
 )
+from ga.jit import HAVE_NUMBA, PARALLEL_LOCK, njit, prange
+
+
+# Special activity pairs as genome row indices
+_PAIR_101 = (ACT_IDX[PAIR_SLA101[0]], ACT_IDX[PAIR_SLA101[1]])
+_PAIR_191 = (ACT_IDX[PAIR_SLA191[0]], ACT_IDX[PAIR_SLA191[1]])
+_CROSS_101_191 = tuple((ACT_IDX[a101], ACT_IDX[a191]) for a101, a191 in CROSS_101_191)
 
+_TYLER = FAC_IDX["Tyler"]
 
-# Map time labels to indices for easy distance calculations
-TIME_INDEX = {t: i for i, t in enumerate(TIME_SLOTS)}
 
+# The fitness kernel below only sees integers; the per-activity and
+# per-room tables it needs (ROOM_CAP, ACT_EXPECTED, PREF_TABLE,
+# OTHER_TABLE, ROOM_BEACH_ROMAN) come precomputed from ga.data.
 
-def _time_diff_hours(time_a: str, time_b: str) -> int:
+# Facilitator preference score per (activity, facilitator), folded from
+# the two boolean tables so the kernels need one lookup instead of two
+# branches: +0.5 preferred, +0.2 other listed, -0.1 anyone else.
+_PREF_SCORE = np.where(PREF_TABLE, 0.5, np.where(OTHER_TABLE, 0.2, -0.1))
+
+
+def _build_room_size_score() -> np.ndarray:
     """
-    Returns the absolute 'step' difference between two time slots.
-    Each step is 1 hour (10 AM -> 11 AM -> 12 PM -> ...).
+    Room size score per (activity, room): both inputs are static, so the
+    whole rule is resolved once here instead of on every evaluation.
+      - room too small            -> -0.5
+      - capacity > 3x expected    -> -0.4
+      - capacity > 1.5x expected  -> -0.2
+      - otherwise (good fit)      -> +0.3
+    Activities with no expected enrollment score 0.
     """
-    if time_a not in TIME_INDEX or time_b not in TIME_INDEX:
-        return 0
-    return abs(TIME_INDEX[time_a] - TIME_INDEX[time_b])
+    expected = ACT_EXPECTED[:, None]
+    capacity = ROOM_CAP[None, :]
+    ratio = capacity / np.where(expected > 0, expected, 1)
+    score = np.where(
+        capacity < expected, -0.5,
+        np.where(ratio > 3.0, -0.4, np.where(ratio > 1.5, -0.2, 0.3)),
+    )
+    return np.where(expected > 0, score, 0.0)
 
 
-def _is_beach_or_roman(room_name: str) -> bool:
-    """Return True if room is in Beach or Roman buildings."""
-    if room_name is None:
-        return False
-    return room_name.startswith("Beach") or room_name.startswith("Roman")
+_ROOM_SIZE_SCORE = _build_room_size_score()
+
+# Plain-Python copies of the same tables for the (non-JIT) violation
+# checker, where indexing a tuple is much cheaper than a NumPy scalar.
+_EXPECTED_BY_ACT = tuple(ACT_EXPECTED.tolist())
+_CAPACITY_BY_ROOM = tuple(ROOM_CAP.tolist())
+_BEACH_ROMAN_BY_ROOM = tuple(ROOM_BEACH_ROMAN.tolist())
+
+
+@njit(cache=True)
+def _time_diff_hours(time_a: int, time_b: int) -> int:
+    """
+    Returns the absolute 'step' difference between two time slot indices.
+    Each step is 1 hour (10 AM -> 11 AM -> 12 PM -> ...).
+    """
+    return abs(time_a - time_b)
 
 
-def _score_pair_time_spacing(act1: str, act2: str, assignments: dict) -> float:
+@njit(cache=True)
+def _score_pair_time_spacing(t1: int, t2: int) -> float:
     """
     Special rule for the two sections of SLA 101 or SLA 191:
         - More than 4 hours apart: +0.5
         - Both in the same time slot: -0.5
     This is computed once per pair and added to act1's score.
     """
-    a1 = assignments.get(act1)
-    a2 = assignments.get(act2)
-    if a1 is None or a2 is None:
-        return 0.0
-
-    t1 = a1.get("time")
-    t2 = a2.get("time")
-    if t1 is None or t2 is None:
-        return 0.0
-
     if t1 == t2:
         # Same time slot: penalty
         return -0.5
@@ -62,9 +98,11 @@ def _score_pair_time_spacing(act1: str, act2: str, assignments: dict) -> float:
     return 0.0
 
 
-def _score_cross_101_191(a101: str, a191: str, assignments: dict) -> float:
+@njit(cache=True)
+def _score_cross_101_191(t1: int, r1: int, t2: int, r2: int) -> float:
     """
-    Special rules for SLA101 (A/B) vs SLA191 (A/B):
+    Special rules for SLA101 (A/B) vs SLA191 (A/B), given the time and
+    room indices of the 101 side (t1, r1) and the 191 side (t2, r2):
 
       - Consecutive time slots (e.g., 10 & 11): +0.5
           In this case only: if one is in Beach/Roman and the other is not:
@@ -76,19 +114,6 @@ def _score_cross_101_191(a101: str, a191: str, assignments: dict) -> float:
 
     This is computed once per pair and added to the 101 side's activity score.
     """
-    a_101 = assignments.get(a101)
-    a_191 = assignments.get(a191)
-    if a_101 is None or a_191 is None:
-        return 0.0
-
-    t1 = a_101.get("time")
-    t2 = a_191.get("time")
-    r1 = a_101.get("room")
-    r2 = a_191.get("room")
-
-    if t1 is None or t2 is None:
-        return 0.0
-
     score = 0.0
 
     if t1 == t2:
@@ -102,11 +127,8 @@ def _score_cross_101_191(a101: str, a191: str, assignments: dict) -> float:
     if diff == 1:
         score += 0.5
         # Check distance penalty: one in Beach/Roman, other not
-        if r1 is not None and r2 is not None:
-            in_b_or_r_1 = _is_beach_or_roman(r1)
-            in_b_or_r_2 = _is_beach_or_roman(r2)
-            if in_b_or_r_1 ^ in_b_or_r_2:
-                score -= 0.4
+        if ROOM_BEACH_ROMAN[r1] != ROOM_BEACH_ROMAN[r2]:
+            score -= 0.4
         return score
 
     # Separated by 1 hour (one-hour gap, e.g., 10 & 12)
@@ -116,6 +138,112 @@ def _score_cross_101_191(a101: str, a191: str, assignments: dict) -> float:
     return score
 
 
+@njit(cache=True, fastmath=True)
+def _genome_fitness(genome) -> float:
+    """
+    Fitness kernel for a single (11, 3) integer genome.
+
+    Written against plain integer arrays so Numba can compile it to
+    native code; without Numba it runs as ordinary Python.
+    """
+    n_acts = genome.shape[0]
+
+    # --------------------------------------------
+    # Pass 1: counts for conflicts & loads, plus the scores that do not
+    # depend on other activities (room size, facilitator preference)
+    # --------------------------------------------
+    room_time_counts = np.zeros((N_ROOMS, N_TIMES), dtype=np.int64)
+    fac_time_counts = np.zeros((N_FACILITATORS, N_TIMES), dtype=np.int64)
+    fac_total_counts = np.zeros(N_FACILITATORS, dtype=np.int64)
+
+    total_fitness = 0.0
+
+    for a in range(n_acts):
+        room = genome[a, 0]
+        time = genome[a, 1]
+        fac = genome[a, 2]
+        room_time_counts[room, time] += 1
+        fac_time_counts[fac, time] += 1
+        fac_total_counts[fac] += 1
+
+        # -------- Room size fitness ------------
+        # Uses expected enrollment vs room capacity (precomputed table)
+        total_fitness += _ROOM_SIZE_SCORE[a, room]
+
+        # -------- Facilitator preference fitness ------------
+        total_fitness += _PREF_SCORE[a, fac]
+
+    # --------------------------------------------
+    # Pass 2: penalties that need the finished counts
+    # --------------------------------------------
+    for a in range(n_acts):
+        score = 0.0
+
+        room = genome[a, 0]
+        time = genome[a, 1]
+        fac = genome[a, 2]
+
+        # -------- Room-time conflict penalty ------------
+        if room_time_counts[room, time] > 1:
+            # This activity shares a room/time slot with at least one other activity
+            score -= 0.5
+
+        # -------- Facilitator same-time load ------------
+        count_ft = fac_time_counts[fac, time]
+        if count_ft == 1:
+            score += 0.2
+        elif count_ft > 1:
+            score -= 0.2
+
+        # -------- Facilitator overall load ------------
+        total = fac_total_counts[fac]
+
+        # Overloaded facilitator
+        if total > 4:
+            score -= 0.5
+
+        # Underused (<3)
+        elif total < 3:
+            if fac == _TYLER:
+                # Tyler exception: NO penalty ONLY if total <2
+                if total >= 2:
+                    score -= 0.4  # Tyler teaching exactly 2 → penalty applies
+            else:
+                score -= 0.4
+
+        total_fitness += score
+
+    # --------------------------------------------
+    # Special SLA101/SLA191 spacing rules
+    # --------------------------------------------
+    # Scored once per pair after the activity loop (each pair counted once),
+    # instead of scanning every pair for every activity.
+
+    # SLA101A/SLA101B
+    total_fitness += _score_pair_time_spacing(genome[_PAIR_101[0], 1], genome[_PAIR_101[1], 1])
+
+    # SLA191A/SLA191B
+    total_fitness += _score_pair_time_spacing(genome[_PAIR_191[0], 1], genome[_PAIR_191[1], 1])
+
+    # Cross pairs: SLA101x vs SLA191y
+    for pair in _CROSS_101_191:
+        total_fitness += _score_cross_101_191(
+            genome[pair[0], 1], genome[pair[0], 0], genome[pair[1], 1], genome[pair[1], 0]
+        )
+
+    return total_fitness
+
+
+@njit(cache=True, parallel=True)
+def _population_fitness(genomes):
+    """Evaluate a (P, 11, 3) stack of genomes, one individual per thread."""
+    n = genomes.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    for p in prange(n):
+        out[p] = _genome_fitness(genomes[p])
+    return out
+
+
 def compute_schedule_fitness(schedule) -> float:
     """
     Compute the total fitness of a schedule according to Appendix A.
@@ -135,129 +263,91 @@ def compute_schedule_fitness(schedule) -> float:
 
       - Sum all activity fitness values to get schedule fitness.
     """
-    assignments = schedule.assignments
+    total_fitness = float(_genome_fitness(schedule.genome))
+    # Store it on the schedule object as a convenience
+    schedule.fitness = total_fitness
+    return total_fitness
 
-    # --------------------------------------------
-    # Precompute counts for conflicts & loads
-    # --------------------------------------------
-    room_time_counts: dict[tuple, int] = {}
-    fac_time_counts: dict[tuple, int] = {}
-    fac_total_counts: dict[str, int] = {}
 
-    for activity, data in assignments.items():
-        room = data.get("room")
-        time = data.get("time")
-        fac = data.get("facilitator")
+def _per_individual_counts(keys, n_keys: int) -> np.ndarray:
+    """
+    For a (P, 11) array of keys in [0, n_keys), return how many activities
+    of the same individual share each activity's key (itself included).
+    One bincount over individual-offset keys replaces per-row counting.
+    """
+    n_pop = keys.shape[0]
+    offset = np.arange(n_pop)[:, None] * n_keys
+    counts = np.bincount((keys + offset).ravel(), minlength=n_pop * n_keys)
+    return np.take_along_axis(counts.reshape(n_pop, n_keys), keys, axis=1)
 
-        if room is not None and time is not None:
-            key_rt = (room, time)
-            room_time_counts[key_rt] = room_time_counts.get(key_rt, 0) + 1
 
-        if fac is not None and time is not None:
-            key_ft = (fac, time)
-            fac_time_counts[key_ft] = fac_time_counts.get(key_ft, 0) + 1
+def _population_fitness_numpy(genomes) -> np.ndarray:
+    """
+    Vectorized NumPy version of _genome_fitness for a (P, 11, 3) stack.
 
-        if fac is not None:
-            fac_total_counts[fac] = fac_total_counts.get(fac, 0) + 1
+    Every rule is evaluated for the whole population at once with
+    broadcasting; room/time and facilitator counts come from a single
+    bincount each (see _per_individual_counts) without any Python loop.
+    """
+    rooms = genomes[:, :, 0].astype(np.intp)
+    times = genomes[:, :, 1].astype(np.intp)
+    facs = genomes[:, :, 2].astype(np.intp)
+    act = np.arange(genomes.shape[1])[None, :]
 
-    # --------------------------------------------
-    # Per-activity fitness accumulation
-    # --------------------------------------------
-    activity_scores: dict[str, float] = {}
+    # -------- Room size fitness ------------
+    room_score = _ROOM_SIZE_SCORE[act, rooms]
 
-    for activity, data in assignments.items():
-        score = 0.0
+    # -------- Facilitator preference fitness ------------
+    pref_score = _PREF_SCORE[act, facs]
 
-        room = data.get("room")
-        time = data.get("time")
-        fac = data.get("facilitator")
+    # -------- Counts (including the activity itself) ------------
+    room_time = rooms * N_TIMES + times
+    fac_time = facs * N_TIMES + times
+    room_time_counts = _per_individual_counts(room_time, N_ROOMS * N_TIMES)
+    fac_time_counts = _per_individual_counts(fac_time, N_FACILITATORS * N_TIMES)
+    fac_total_counts = _per_individual_counts(facs, N_FACILITATORS)
 
-        # -------- Room size fitness ------------
-        # Uses expected enrollment vs room capacity
-        if room is not None and activity in ACTIVITIES:
-            expected = ACTIVITIES[activity]["expected"]
-            capacity = ROOMS.get(room)
-            if capacity is not None and expected > 0:
-                if capacity < expected:
-                    # Room too small
-                    score -= 0.5
-                else:
-                    ratio = capacity / expected
-                    if ratio > 3.0:
-                        score -= 0.4
-                    elif ratio > 1.5:
-                        score -= 0.2
-                    else:
-                        # Good fit
-                        score += 0.3
+    # -------- Room-time conflict penalty ------------
+    conflict_score = np.where(room_time_counts > 1, -0.5, 0.0)
 
-        # -------- Facilitator preference fitness ------------
-        if fac is not None and activity in ACTIVITIES:
-            preferred = ACTIVITIES[activity]["preferred"]
-            other = ACTIVITIES[activity]["other"]
-            if fac in preferred:
-                score += 0.5
-            elif fac in other:
-                score += 0.2
-            else:
-                score -= 0.1
+    # -------- Facilitator same-time load ------------
+    same_time_score = np.where(fac_time_counts == 1, 0.2, -0.2)
 
-        # -------- Room-time conflict penalty ------------
-        if room is not None and time is not None:
-            if room_time_counts.get((room, time), 0) > 1:
-                # This activity shares a room/time slot with at least one other activity
-                score -= 0.5
+    # -------- Facilitator overall load (Tyler exception below 2) ------------
+    underused = (fac_total_counts < 3) & ((facs != _TYLER) | (fac_total_counts >= 2))
+    load_score = np.where(fac_total_counts > 4, -0.5, np.where(underused, -0.4, 0.0))
+
+    total = (room_score + pref_score + conflict_score + same_time_score + load_score).sum(axis=1)
+
+    # -------- Special SLA101/SLA191 spacing rules ------------
+    for first, second in (_PAIR_101, _PAIR_191):
+        diff = np.abs(times[:, first] - times[:, second])
+        total += np.where(diff == 0, -0.5, np.where(diff > 4, 0.5, 0.0))
+
+    for a101, a191 in _CROSS_101_191:
+        diff = np.abs(times[:, a101] - times[:, a191])
+        walk = ROOM_BEACH_ROMAN[rooms[:, a101]] != ROOM_BEACH_ROMAN[rooms[:, a191]]
+        total += np.where(
+            diff == 0, -0.25,
+            np.where(diff == 1, np.where(walk, 0.1, 0.5), np.where(diff == 2, 0.25, 0.0)),
+        )
+
+    return total
+
+
+def evaluate_genomes(genomes) -> np.ndarray:
+    """
+    Compute the fitness of every genome in a (P, 11, 3) array in one call.
+    With Numba installed the individuals are scored in parallel threads;
+    otherwise the rules are broadcast across the population with NumPy.
+    """
+    genomes = np.ascontiguousarray(genomes, dtype=np.int8)
+    if HAVE_NUMBA:
+        with PARALLEL_LOCK:
+            return _population_fitness(genomes)
+    return _population_fitness_numpy(genomes)
 
-        # -------- Facilitator same-time load ------------
-        if fac is not None and time is not None:
-            count_ft = fac_time_counts.get((fac, time), 0)
-            if count_ft == 1:
-                score += 0.2
-            elif count_ft > 1:
-                score -= 0.2
 
-        # -------- Facilitator overall load ------------
-        if fac is not None:
-            total = fac_total_counts.get(fac, 0)
-
-            # Overloaded facilitator
-            if total > 4:
-                score -= 0.5
-
-            # Underused (<3)
-            elif total < 3:
-                if fac == "Tyler":
-                    # Tyler exception: NO penalty ONLY if total <2
-                    if total >= 2:
-                        score -= 0.4  # Tyler teaching exactly 2 → penalty applies
-                else:
-                    score -= 0.4
-
-        # -------- Special SLA101/SLA191 spacing rules ------------
-        # To avoid double-counting, we only apply pair-based scores
-        # when this activity is the "first" member in the pair.
-
-        # SLA101A/SLA101B
-        if activity == PAIR_SLA101[0]:
-            score += _score_pair_time_spacing(PAIR_SLA101[0], PAIR_SLA101[1], assignments)
-
-        # SLA191A/SLA191B
-        if activity == PAIR_SLA191[0]:
-            score += _score_pair_time_spacing(PAIR_SLA191[0], PAIR_SLA191[1], assignments)
-
-        # Cross pairs: SLA101x vs SLA191y
-        # Add the entire cross-pair score to the SLA101 (first element) side.
-        for (a101, a191) in CROSS_101_191:
-            if activity == a101:
-                score += _score_cross_101_191(a101, a191, assignments)
-
-        activity_scores[activity] = score
-
-    # Sum up all activity scores to get schedule fitness
-    total_fitness = sum(activity_scores.values())
-    # Store it on the schedule object as a convenience
-    schedule.fitness = total_fitness
-    return total_fitness
 # -----------------------------------------------------------
 # COMPLETE CONSTRAINT VIOLATION CHECKER (Matches Fitness Exactly)
 # -----------------------------------------------------------
@@ -279,7 +369,7 @@ def compute_violations(schedule):
       - SLA101 vs SLA191 spacing & distance penalties
     """
 
-    assignments = schedule.assignments
+    genome = schedule.genome.tolist()
 
     # Counters
     violations = {
@@ -298,33 +388,28 @@ def compute_violations(schedule):
         "sla101_191_consecutive_ok": 0,
     }
 
-    # Precompute data for conflicts & loads
-    room_time_counts = {}
-    fac_time_counts = {}
-    fac_total = {}
+    # Precompute data for conflicts & loads (flat count arrays indexed by id)
+    room_time_counts = [0] * (N_ROOMS * N_TIMES)
+    fac_time_counts = [0] * (N_FACILITATORS * N_TIMES)
+    fac_total = [0] * N_FACILITATORS
 
     # -----------------------------------------------------------
     # PASS 1: Count things needed for violations
     # -----------------------------------------------------------
-    for act, d in assignments.items():
-        room = d["room"]
-        time = d["time"]
-        fac = d["facilitator"]
+    for a, (room, time, fac) in enumerate(genome):
 
         # Room-time conflicts
-        key_rt = (room, time)
-        room_time_counts[key_rt] = room_time_counts.get(key_rt, 0) + 1
+        room_time_counts[room * N_TIMES + time] += 1
 
         # Facilitator same-time load
-        key_ft = (fac, time)
-        fac_time_counts[key_ft] = fac_time_counts.get(key_ft, 0) + 1
+        fac_time_counts[fac * N_TIMES + time] += 1
 
         # Facilitator total load
-        fac_total[fac] = fac_total.get(fac, 0) + 1
+        fac_total[fac] += 1
 
         # Room size violations
-        expected = ACTIVITIES[act]["expected"]
-        capacity = ROOMS.get(room)
+        expected = _EXPECTED_BY_ACT[a]
+        capacity = _CAPACITY_BY_ROOM[room]
 
         if capacity < expected:
             violations["room_too_small"] += 1
@@ -338,14 +423,17 @@ def compute_violations(schedule):
     # -----------------------------------------------------------
     # Room-time conflict count
     # -----------------------------------------------------------
-    for (room, time), count in room_time_counts.items():
+    for count in room_time_counts:
         if count > 1:
             violations["room_conflicts"] += (count - 1)
 
     # -----------------------------------------------------------
     # Facilitator overload/underload & same-time conflicts
     # -----------------------------------------------------------
-    for fac, total in fac_total.items():
+    for fac, total in enumerate(fac_total):
+        if total == 0:
+            # Unassigned facilitators are not underloaded
+            continue
 
         # Overload (>4)
         if total > 4:
@@ -353,14 +441,14 @@ def compute_violations(schedule):
 
         # Underload (<3)
         if total < 3:
-            if fac == "Tyler":
+            if fac == _TYLER:
                 # Tyler exception: no penalty ONLY if <2
                 if total >= 2:
                     violations["facilitator_underload"] += 1
             else:
                 violations["facilitator_underload"] += 1
 
-    for (fac, time), count in fac_time_counts.items():
+    for count in fac_time_counts:
         if count > 1:
             violations["facilitator_same_time_conflict"] += (count - 1)
 
@@ -368,28 +456,23 @@ def compute_violations(schedule):
     # SLA101A/B and SLA191A/B same-slot or spacing
     # -----------------------------------------------------------
     # 101 pair
-    t1 = assignments[PAIR_SLA101[0]]["time"]
-    t2 = assignments[PAIR_SLA101[1]]["time"]
+    t1 = genome[_PAIR_101[0]][1]
+    t2 = genome[_PAIR_101[1]][1]
     if t1 == t2:
         violations["sla101_same_slot"] += 1
 
     # 191 pair
-    t3 = assignments[PAIR_SLA191[0]]["time"]
-    t4 = assignments[PAIR_SLA191[1]]["time"]
+    t3 = genome[_PAIR_191[0]][1]
+    t4 = genome[_PAIR_191[1]][1]
     if t3 == t4:
         violations["sla191_same_slot"] += 1
 
     # -----------------------------------------------------------
     # SLA101 ↔ SLA191 cross-pair rules
     # -----------------------------------------------------------
-    for (a101, a191) in CROSS_101_191:
-        d101 = assignments[a101]
-        d191 = assignments[a191]
-
-        time101 = d101["time"]
-        time191 = d191["time"]
-        room101 = d101["room"]
-        room191 = d191["room"]
+    for (a101, a191) in _CROSS_101_191:
+        room101, time101, _ = genome[a101]
+        room191, time191, _ = genome[a191]
 
         if time101 == time191:
             violations["sla101_191_same_slot"] += 1
@@ -401,12 +484,12 @@ def compute_violations(schedule):
             # Consecutive OK
             violations["sla101_191_consecutive_ok"] += 1
             # Check distance penalty
-            inA = _is_beach_or_roman(room101)
-            inB = _is_beach_or_roman(room191)
+            inA = _BEACH_ROMAN_BY_ROOM[room101]
+            inB = _BEACH_ROMAN_BY_ROOM[room191]
             if inA ^ inB:
                 violations["sla101_191_distance_issue"] += 1
 
         elif diff == 2:
             violations["sla101_191_one_hour_gap"] += 1
 
-    return violations
\ No newline at end of file
+    return violations
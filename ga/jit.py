@@ -0,0 +1,65 @@
+# -----------------------------------------------------------
+#  Optional Numba JIT support
+# -----------------------------------------------------------
+# Numba is an optional dependency. When it is installed, kernels
+# decorated with @njit run as compiled native code; otherwise the same
+# functions run as plain Python and prange falls back to range.
+
+import contextlib
+import importlib
+import os
+import threading
+
+try:
+    import numba
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:
+    numba = None
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# Streamlit runs every script off the main thread. After a parallel kernel
+# has run in such a thread, the TBB threading layer can hang the interpreter
+# at exit, so OpenMP is tried first. An explicit NUMBA_THREADING_LAYER or
+# NUMBA_THREADING_LAYER_PRIORITY from the environment still wins.
+if HAVE_NUMBA and "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+
+def _only_workqueue() -> bool:
+    """True when Numba's parallel kernels will run on the workqueue layer."""
+    layer = numba.config.THREADING_LAYER
+    if layer != "default":
+        return layer == "workqueue"
+    for pool in ("omppool", "tbbpool"):
+        try:
+            importlib.import_module("numba.np.ufunc." + pool)
+            return False
+        except (ImportError, OSError):
+            pass
+    return True
+
+
+# The workqueue layer is not thread-safe: two sessions launching parallel
+# kernels at once abort the process. In that case every launch is
+# serialized through one lock; with OpenMP/TBB (or no Numba) it is a no-op.
+PARALLEL_LOCK = threading.Lock() if HAVE_NUMBA and _only_workqueue() else contextlib.nullcontext()
+
+
+def set_num_threads(n_workers: int) -> None:
+    """Limit Numba's parallel kernels to n_workers threads (no-op without Numba)."""
+    if HAVE_NUMBA:
+        numba.set_num_threads(max(1, min(n_workers, numba.config.NUMBA_NUM_THREADS)))
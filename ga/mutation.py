@@ -2,32 +2,27 @@
 #  PHASE 5: Mutation
 # -----------------------------------------------------------
 
-import random
-from ga.data import ROOMS, TIME_SLOTS, FACILITATORS, ACTIVITIES
+import numpy as np
+from ga.data import N_ACTIVITIES, GENE_DOMAIN_SIZES
+from ga.rng import RNG
 
 
-def mutate(schedule, mutation_rate=0.01):
+_DOMAIN_SIZES = np.array(GENE_DOMAIN_SIZES)
+
+
+def sample_mutations(n_genomes, mutation_rate=0.01, rng=RNG):
     """
-    Mutates the schedule IN PLACE.
+    Draw the mutations for n_genomes genomes at once.
 
     For each activity:
         For each attribute (room/time/facilitator):
             With probability mutation_rate:
                 Replace with a random valid value.
-    """
-    for activity in ACTIVITIES.keys():
-        assignment = schedule.assignments[activity]
-
-        # Mutate room
-        if random.random() < mutation_rate:
-            assignment["room"] = random.choice(list(ROOMS.keys()))
 
-        # Mutate time
-        if random.random() < mutation_rate:
-            assignment["time"] = random.choice(TIME_SLOTS)
-
-        # Mutate facilitator
-        if random.random() < mutation_rate:
-            assignment["facilitator"] = random.choice(FACILITATORS)
-
-    return schedule  # return for convenience
+    Returns (mask, values), both shaped (n_genomes, 11, 3): mask marks the
+    genes that mutate, values holds a random valid index for every gene.
+    Draws come from `rng` (a NumPy Generator).
+    """
+    mask = rng.random((n_genomes, N_ACTIVITIES, 3)) < mutation_rate
+    values = rng.integers(_DOMAIN_SIZES, size=(n_genomes, N_ACTIVITIES, 3), dtype=np.int8)
+    return mask, values
@@ -2,60 +2,48 @@
 #  PHASE 3: Population Initialization (Random Schedules)
 # -----------------------------------------------------------
 
-import random
-from ga.data import ACTIVITIES, ROOMS, TIME_SLOTS, FACILITATORS
+import numpy as np
+from ga.data import N_ACTIVITIES, GENE_DOMAIN_SIZES
+from ga.rng import RNG
 from ga.schedule import Schedule
 
 
 # -----------------------------------------------------------
 # Random Assignment for a Single Activity
 # -----------------------------------------------------------
-def random_assignment():
+def random_assignment(rng=RNG):
     """
-    Returns a dictionary like:
-        {"room": <room>, "time": <time>, "facilitator": <facilitator>}
-    Selected uniformly at random from their domains.
+    Returns a genome row like:
+        [<room_idx>, <time_idx>, <facilitator_idx>]
+    Selected uniformly at random from their domains (drawn from `rng`).
 
     IMPORTANT:
     - Does NOT use preferred facilitators.
     - All facilitators are available as required by instructions.
     """
-    room = random.choice(list(ROOMS.keys()))
-    time = random.choice(TIME_SLOTS)
-    facilitator = random.choice(FACILITATORS)
-
-    return {
-        "room": room,
-        "time": time,
-        "facilitator": facilitator,
-    }
+    return rng.integers(GENE_DOMAIN_SIZES).tolist()
 
 
 # -----------------------------------------------------------
 # Generate One Full Random Schedule
 # -----------------------------------------------------------
-def random_schedule():
+def random_schedule(rng=RNG):
     """
     Creates a Schedule object and fills in ALL 11 activities
-    with random (room, time, facilitator) assignments.
+    with random (room, time, facilitator) assignments drawn from `rng`.
     """
-    schedule = Schedule()
-
-    for activity in ACTIVITIES.keys():
-        schedule.assignments[activity] = random_assignment()
-
-    return schedule
+    return Schedule(rng.integers(GENE_DOMAIN_SIZES, size=(N_ACTIVITIES, 3)))
 
 
 # -----------------------------------------------------------
 # Initialize Full Population (Generation 0)
 # -----------------------------------------------------------
-def initialize_population(size=250):
+def initialize_population(size=250, rng=RNG):
     """
-    Returns a list of <size> random Schedule objects.
+    Returns <size> random genomes as ONE contiguous (size, 11, 3) int8
+    array (a few dozen bytes per schedule instead of a Python object
+    each). Row p is the genome of schedule p; wrap a row in Schedule(...)
+    when a Schedule object is needed. Draws come from `rng`.
     Requirement: size >= 250
     """
-    population = []
-    for _ in range(size):
-        population.append(random_schedule())
-    return population
+    return rng.integers(GENE_DOMAIN_SIZES, size=(size, N_ACTIVITIES, 3), dtype=np.int8)
@@ -0,0 +1,14 @@
+# -----------------------------------------------------------
+#  Default Random Number Generator
+# -----------------------------------------------------------
+# GA operators take an `rng` (NumPy Generator) argument and fall back to
+# this module-level one when called on their own. Batched draws (one call
+# returning an array) are far cheaper than per-value stdlib `random`
+# calls. A GA run creates its own Generator from its seed, so concurrent
+# runs (e.g. two Streamlit sessions) never share or reseed state.
+
+import numpy as np
+
+
+RNG = np.random.default_rng()
+
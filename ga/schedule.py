@@ -2,9 +2,29 @@
 #  PHASE 2: Schedule Representation for Genetic Algorithm
 # -----------------------------------------------------------
 
-from copy import deepcopy
+import csv
+import os
+
+import numpy as np
 import pandas as pd
-from ga.data import ACTIVITIES, ROOMS, TIME_SLOTS, FACILITATORS
+from ga.data import (
+    ACTIVITY_NAMES,
+    ROOM_NAMES,
+    TIME_SLOTS,
+    FACILITATORS,
+    N_ACTIVITIES,
+    GENE_ROOM,
+    GENE_TIME,
+    GENE_FAC,
+    GENE_DOMAIN_SIZES,
+)
+
+
+# One line of Schedule.__str__ (activity, room, time, facilitator)
+_LINE_FMT = "{:8s}  |  Room: {:<10s}  |  Time: {:<5s}  |  Facilitator: {}".format
+
+# Valid index range per genome column (room, time, facilitator)
+_DOMAIN_SIZES = np.array(GENE_DOMAIN_SIZES)
 
 
 class Schedule:
@@ -15,6 +35,10 @@ class Schedule:
         - time
         - facilitator
 
+    The schedule is stored as an integer genome: an (11, 3) int8 array
+    where row i holds the (room, time, facilitator) indices of
+    ACTIVITY_NAMES[i]. Names are only materialized when exporting.
+
     This class provides:
         - initialization
         - deep copying
@@ -22,45 +46,76 @@ class Schedule:
         - readable string formatting
     """
 
-    def __init__(self, assignments=None):
+    # Fixed attributes only: no per-instance __dict__, smaller objects
+    __slots__ = ("genome", "fitness")
+
+    def __init__(self, genome):
+        """
+        genome: (11, 3) integer array of
+            [room_idx, time_idx, facilitator_idx] rows.
+        Every index must lie in its column's domain (0 <= g < size, see
+        GENE_DOMAIN_SIZES). It is checked on the input before the int8
+        cast, because an out-of-range value would otherwise wrap around or
+        silently decode as some other room/time/facilitator (-1 as the
+        last one). Anything else raises ValueError.
         """
-        assignments: optional dictionary like:
+        genome = np.asarray(genome)
+        if (
+            genome.shape != (N_ACTIVITIES, 3)
+            or not np.issubdtype(genome.dtype, np.integer)
+            or (genome < 0).any()
+            or (genome >= _DOMAIN_SIZES).any()
+        ):
+            raise ValueError("genome must be an (11, 3) integer array of in-range indices")
+        self.genome = genome.astype(np.int8, copy=False)
+
+        # Set fitness score placeholder (optional but convenient)
+        self.fitness = None
+
+    # -----------------------------------------------------------
+    # Decoded View
+    # -----------------------------------------------------------
+    @property
+    def assignments(self):
+        """
+        Decode the genome into a dictionary like:
             {
                 "SLA101A": {"room": "...", "time": "...", "facilitator": "..."},
                 ...
             }
-        If None → create empty structure (GA will fill later)
+        This is a read-only view; edit self.genome to change the schedule.
         """
-        if assignments is None:
-            # Create empty assignment slots for all activities
-            self.assignments = {
-                activity: {"room": None, "time": None, "facilitator": None}
-                for activity in ACTIVITIES.keys()
+        return {
+            activity: {
+                "room": ROOM_NAMES[row[GENE_ROOM]],
+                "time": TIME_SLOTS[row[GENE_TIME]],
+                "facilitator": FACILITATORS[row[GENE_FAC]],
             }
-        else:
-            self.assignments = assignments
+            for activity, row in zip(ACTIVITY_NAMES, self.genome.tolist())
+        }
 
-        # Set fitness score placeholder (optional but convenient)
-        self.fitness = None
+    # -----------------------------------------------------------
+    # Hash Key
+    # -----------------------------------------------------------
+    def hash_key(self):
+        """Return the raw genome bytes, a cheap hashable identity for caching."""
+        return self.genome.tobytes()
 
     # -----------------------------------------------------------
     # Deep Copy
     # -----------------------------------------------------------
     def copy(self):
         """Return a deep copy of this schedule."""
-        return Schedule(deepcopy(self.assignments))
+        return Schedule(self.genome.copy())
 
     # -----------------------------------------------------------
     # Pretty Print
     # -----------------------------------------------------------
     def __str__(self):
-        lines = []
-        for activity, data in self.assignments.items():
-            lines.append(
-                f"{activity:8s}  |  Room: {data['room']:<10s}  |  "
-                f"Time: {data['time']:<5s}  |  Facilitator: {data['facilitator']}"
-            )
-        return "\n".join(lines)
+        return "\n".join(
+            _LINE_FMT(activity, ROOM_NAMES[room], TIME_SLOTS[time], FACILITATORS[fac])
+            for activity, (room, time, fac) in zip(ACTIVITY_NAMES, self.genome.tolist())
+        )
 
     # -----------------------------------------------------------
     # Export as Pandas DataFrame (perfect for Streamlit)
@@ -69,20 +124,25 @@ class Schedule:
         """
         Convert schedule into a DataFrame:
         Activity | Room | Time | Facilitator
+
+        "Time" is an ordered Categorical over TIME_SLOTS, so sorting by it
+        is chronological (10 AM ... 3 PM) rather than alphabetical.
         """
-        records = []
-        for activity, data in self.assignments.items():
-            records.append({
-                "Activity": activity,
-                "Room": data["room"],
-                "Time": data["time"],
-                "Facilitator": data["facilitator"],
-            })
-        return pd.DataFrame(records)
+        rooms, times, facs = self.genome.T.tolist()
+        return pd.DataFrame({
+            "Activity": ACTIVITY_NAMES,
+            "Room": [ROOM_NAMES[r] for r in rooms],
+            "Time": pd.Categorical.from_codes(times, categories=TIME_SLOTS, ordered=True),
+            "Facilitator": [FACILITATORS[f] for f in facs],
+        })
 
     # -----------------------------------------------------------
     # Export CSV
     # -----------------------------------------------------------
     def save_csv(self, filepath):
-        df = self.to_dataframe()
-        df.to_csv(filepath, index=False)
+        """Write the decoded schedule as CSV (same columns as to_dataframe)."""
+        with open(filepath, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(["Activity", "Room", "Time", "Facilitator"])
+            for activity, (room, time, fac) in zip(ACTIVITY_NAMES, self.genome.tolist()):
+                writer.writerow([activity, ROOM_NAMES[room], TIME_SLOTS[time], FACILITATORS[fac]])
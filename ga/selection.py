@@ -2,32 +2,32 @@
 #  PHASE 5: Selection (Softmax + Parent Pair Selection)
 # -----------------------------------------------------------
 
-import math
-import random
+import numpy as np
+from ga.rng import RNG
 
 
 def softmax(fitness_list):
     """
-    Convert a list of fitness values to a probability distribution.
+    Convert fitness values (list or array) to a probability distribution.
     p_i = exp(f_i) / Σ exp(f_j)
+
+    Returns a NumPy array, computed in one vectorized pass.
     """
+    f = np.asarray(fitness_list, dtype=np.float64)
     # Stabilize by subtracting max before exponentiation (avoids overflow)
-    max_f = max(fitness_list)
-    exp_values = [math.exp(f - max_f) for f in fitness_list]
-    total = sum(exp_values)
-    return [ev / total for ev in exp_values]
+    exp_values = np.exp(f - f.max())
+    return exp_values / exp_values.sum()
 
 
-def select_parents(population, probabilities, num_pairs):
+def select_parent_indices(probabilities, num_pairs, rng=RNG):
     """
-    Select `num_pairs` pairs of parents according to softmax probabilities.
+    Draw `num_pairs` pairs of population indices according to softmax
+    probabilities. Returns an int array of shape (num_pairs, 2).
 
-    Returns a list of tuples: [(parentA, parentB), ...]
+    Roulette wheel by inverse CDF: the cumulative weights are built once
+    and every parent of every pair is located with one searchsorted call.
+    The uniform draws come from `rng` (a NumPy Generator).
     """
-    parents = []
-    for _ in range(num_pairs):
-        # random.choices chooses with replacement using probability weights
-        parent_a = random.choices(population, weights=probabilities, k=1)[0]
-        parent_b = random.choices(population, weights=probabilities, k=1)[0]
-        parents.append((parent_a, parent_b))
-    return parents
+    cum = np.cumsum(probabilities)
+    cum /= cum[-1]  # guard against rounding so the wheel ends exactly at 1
+    return np.searchsorted(cum, rng.random((num_pairs, 2)), side="right")